@@ -6,7 +6,7 @@ SELECT
 	,pp.patent_title as "Cited Patent Title"
 	,pp.year as "Year"
 	,pp.grant_date as "Grant Date"
-	,pp.uspc_class as "USPC Class"
+	,pp.cpc_group_id as "CPC Subsections"
 FROM
 	patents as p
 LEFT JOIN
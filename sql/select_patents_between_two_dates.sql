@@ -11,7 +11,7 @@ SELECT
     an.name as "Company Name Listed on Patent",
     p.year,
     p.grant_date as "Grant Date",
-    p.uspc_class as "USPC Classes"
+    p.cpc_group_id as "CPC Subsections"
 FROM 
     patents as p
 JOIN 
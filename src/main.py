@@ -503,6 +503,14 @@ def fetch_patents_for_all_companies_in_db(resume_from_company_id=None, verbose=F
 def main():
     options = get_options()
 
+    # Exporting only reads the local database, so no requests are sent to the API
+    if options.export_parquet:
+        # pyarrow is only needed for the export, so it is imported here
+        from parquet_export import export_to_parquet, EXPORT_CHUNK_SIZE
+        chunk_size = options.export_chunk_size or EXPORT_CHUNK_SIZE
+        export_to_parquet(engine, options.export_parquet, chunk_size=chunk_size)
+        return
+
     # Insert company names
     if options.path:
         try:
@@ -577,6 +585,17 @@ def get_options():
         help="The companies whose patents you want to retrieve."
     )
 
+    parser.add_argument(
+        '--export-parquet', type=str, metavar="output_dir",
+        help="If passed, export the tables and the sql/ queries to Parquet files (partitioned by grant year) "
+             "in this directory, without calling the API."
+    )
+
+    parser.add_argument(
+        '--export-chunk-size', type=int, metavar="rows",
+        help="The number of rows read from the database and written to Parquet at a time (default: 50000)."
+    )
+
     parser.add_argument(
         '--verbose', action="store_true",
         help="Enable verbose."
@@ -0,0 +1,223 @@
+import os
+import shutil
+from sqlalchemy import text
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Number of rows fetched from SQLite and written to Parquet at a time.
+# Only one chunk is held in memory, regardless of the size of the database.
+EXPORT_CHUNK_SIZE = 50000
+
+# Hive/Spark convention for the directory of rows whose partition value is NULL
+# (e.g. cited patents that have not been populated in the patents table yet)
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# Each dataset is written to <output directory>/<name>/. The datasets that have a partition column are
+# written as <name>/<partition column>=<value>/part-0.parquet so that Spark, DuckDB, etc. can prune by grant year.
+# The queries mirror the tables and the scripts in the sql/ folder, with column names that are easy to use
+# in dataframes. Dates are selected with SQLite's DATE() and cast to date32 when written.
+EXPORT_DATASETS = [
+    {
+        "name": "companies",
+        "query": "SELECT id, name, assignee_id, assignee_key_id FROM companies ORDER BY id",
+        "schema": pa.schema([
+            ("id", pa.int64()),
+            ("name", pa.string()),
+            ("assignee_id", pa.string()),
+            ("assignee_key_id", pa.string()),
+        ]),
+        "partition_by": None,
+    },
+    {
+        "name": "patents",
+        "query": """
+            SELECT
+                id, patent_number, patent_title, company_id, company_alternate_name_id, year,
+                DATE(grant_date) AS grant_date, cpc_group_id, assignee_first_name, assignee_last_name
+            FROM
+                patents
+            ORDER BY
+                year, id
+        """,
+        "schema": pa.schema([
+            ("id", pa.int64()),
+            ("patent_number", pa.string()),
+            ("patent_title", pa.string()),
+            ("company_id", pa.int64()),
+            ("company_alternate_name_id", pa.int64()),
+            ("year", pa.int64()),
+            ("grant_date", pa.date32()),
+            ("cpc_group_id", pa.string()),
+            ("assignee_first_name", pa.string()),
+            ("assignee_last_name", pa.string()),
+        ]),
+        "partition_by": "year",
+    },
+    {
+        "name": "cited_patents",
+        "query": "SELECT id, citing_patent_number, cited_patent_number FROM cited_patents ORDER BY id",
+        "schema": pa.schema([
+            ("id", pa.int64()),
+            ("citing_patent_number", pa.string()),
+            ("cited_patent_number", pa.string()),
+        ]),
+        "partition_by": None,
+    },
+    # sql/select_patents_between_two_dates.sql, without the date filter
+    {
+        "name": "company_patents",
+        "query": """
+            SELECT
+                p.patent_number, p.patent_title, c.name AS company_name, an.name AS company_name_on_patent,
+                p.year, DATE(p.grant_date) AS grant_date, p.cpc_group_id
+            FROM
+                patents AS p
+            JOIN
+                companies AS c
+            ON
+                p.company_id = c.id
+            LEFT JOIN
+                alternate_company_names AS an
+            ON
+                p.company_alternate_name_id = an.id
+            ORDER BY
+                p.year
+        """,
+        "schema": pa.schema([
+            ("patent_number", pa.string()),
+            ("patent_title", pa.string()),
+            ("company_name", pa.string()),
+            ("company_name_on_patent", pa.string()),
+            ("year", pa.int64()),
+            ("grant_date", pa.date32()),
+            ("cpc_group_id", pa.string()),
+        ]),
+        "partition_by": "year",
+    },
+    # sql/select_cited_patents.sql, partitioned by the grant year of the cited patent
+    {
+        "name": "cited_patent_details",
+        "query": """
+            SELECT DISTINCT
+                p.patent_number AS citing_patent_number, co.name AS citing_company,
+                cp.cited_patent_number, pp.patent_title AS cited_patent_title,
+                pp.year, DATE(pp.grant_date) AS grant_date, pp.cpc_group_id
+            FROM
+                patents AS p
+            LEFT JOIN
+                companies AS co
+            ON
+                co.id = p.company_id
+            JOIN
+                cited_patents AS cp
+            ON
+                p.patent_number = cp.citing_patent_number
+            LEFT JOIN
+                patents AS pp
+            ON
+                cp.cited_patent_number = pp.patent_number
+            ORDER BY
+                pp.year
+        """,
+        "schema": pa.schema([
+            ("citing_patent_number", pa.string()),
+            ("citing_company", pa.string()),
+            ("cited_patent_number", pa.string()),
+            ("cited_patent_title", pa.string()),
+            ("year", pa.int64()),
+            ("grant_date", pa.date32()),
+            ("cpc_group_id", pa.string()),
+        ]),
+        "partition_by": "year",
+    },
+]
+
+
+def rows_to_table(rows, schema):
+    columns = list(zip(*rows))
+    arrays = []
+    for i, field in enumerate(schema):
+        if pa.types.is_date32(field.type):
+            # SQLite returns dates as 'YYYY-MM-DD' strings
+            arrays.append(pa.array(columns[i], type=pa.string()).cast(field.type))
+        else:
+            arrays.append(pa.array(columns[i], type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def split_by_partition(table, partition_by):
+    # Yields (partition value, rows of the partition without the partition column)
+    partition_column = table.column(partition_by)
+    data = table.select([name for name in table.column_names if name != partition_by])
+    for value in pc.unique(partition_column).to_pylist():
+        if value is None:
+            mask = pc.is_null(partition_column)
+        else:
+            mask = pc.equal(partition_column, value)
+        yield value, data.filter(mask)
+
+
+def export_dataset(engine, dataset, output_dir, chunk_size=EXPORT_CHUNK_SIZE):
+    dataset_dir = os.path.join(output_dir, dataset["name"])
+    # Remove the previous export so that stale partitions are not mixed in with the new files
+    if os.path.exists(dataset_dir):
+        shutil.rmtree(dataset_dir)
+    os.makedirs(dataset_dir)
+
+    schema = dataset["schema"]
+    partition_by = dataset["partition_by"]
+    if partition_by:
+        file_schema = schema.remove(schema.get_field_index(partition_by))
+    else:
+        file_schema = schema
+
+    # One writer per partition; each chunk is appended to the writers as a new row group.
+    # The queries are ordered by the partition column so that only a few writers receive each chunk.
+    writers = {}
+    number_of_rows = 0
+    try:
+        with engine.connect() as connection:
+            result = connection.execution_options(stream_results=True).execute(text(dataset["query"]))
+            while True:
+                rows = result.fetchmany(chunk_size)
+                if not rows:
+                    break
+                table = rows_to_table(rows, schema)
+                if partition_by:
+                    partitions = split_by_partition(table, partition_by)
+                else:
+                    partitions = [(None, table)]
+
+                for value, partition in partitions:
+                    if value not in writers:
+                        if partition_by:
+                            directory_value = NULL_PARTITION if value is None else value
+                            partition_dir = os.path.join(dataset_dir, "%s=%s" % (partition_by, directory_value))
+                        else:
+                            partition_dir = dataset_dir
+                        os.makedirs(partition_dir, exist_ok=True)
+                        writers[value] = pq.ParquetWriter(os.path.join(partition_dir, "part-0.parquet"),
+                                                          file_schema)
+                    writers[value].write_table(partition)
+                number_of_rows += len(rows)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    # Write an empty file for empty tables so readers still find the schema
+    if not writers and not partition_by:
+        pq.write_table(file_schema.empty_table(), os.path.join(dataset_dir, "part-0.parquet"))
+
+    return number_of_rows
+
+
+def export_to_parquet(engine, output_dir, chunk_size=EXPORT_CHUNK_SIZE):
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    output_dir = os.path.normpath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    for dataset in EXPORT_DATASETS:
+        print("Exporting %s to %s" % (dataset["name"], os.path.join(output_dir, dataset["name"])))
+        number_of_rows = export_dataset(engine, dataset, output_dir, chunk_size=chunk_size)
+        print("Exported %d rows." % number_of_rows)